@@ -0,0 +1,64 @@
+import sys
+import warnings
+
+from setuptools import Extension
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, PlatformError
+
+if sys.platform == "win32":
+    compile_args = ["/O2", "/fp:fast"]
+    openmp_compile_args = ["/openmp"]
+    openmp_link_args = []
+else:
+    compile_args = ["-O3", "-ffast-math"]
+    openmp_compile_args = ["-fopenmp"]
+    openmp_link_args = ["-fopenmp"]
+
+
+class OptionalBuildExt(build_ext):
+    """Build the Boussinesq kernel if the compiler allows, and skip it otherwise.
+
+    OpenMP is dropped when the compiler rejects it, as Apple clang does. Without a
+    working compiler the package installs without the extension and geotech.loads
+    falls back to the other kernels.
+    """
+
+    def run(self):
+        try:
+            super().run()
+        except PlatformError as error:
+            warnings.warn(f"Skipping the compiled Boussinesq kernel: {error}")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+            return
+        except CCompilerError:
+            pass
+
+        ext.extra_compile_args = compile_args
+        ext.extra_link_args = []
+        try:
+            super().build_extension(ext)
+        except CCompilerError as error:
+            warnings.warn(f"Skipping the compiled Boussinesq kernel: {error}")
+
+
+def pdm_build_update_setup_kwargs(context, setup_kwargs):
+    """Add the Boussinesq kernel extension, when Cython is available."""
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        warnings.warn("Cython is not installed, skipping the compiled kernel")
+        return
+
+    extension = Extension(
+        "geotech._boussinesq",
+        ["src/geotech/_boussinesq.pyx"],
+        extra_compile_args=compile_args + openmp_compile_args,
+        extra_link_args=openmp_link_args,
+    )
+    setup_kwargs.update(
+        ext_modules=cythonize([extension]),
+        cmdclass={"build_ext": OptionalBuildExt},
+    )
@@ -0,0 +1,34 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Ahead-of-time compiled Boussinesq kernel, used by geotech.loads when built"""
+
+from cython cimport floating
+from cython.parallel cimport prange
+from libc.math cimport M_PI, sqrt
+
+
+def boussinesq(
+    const floating[:] Q,
+    double x,
+    double y,
+    const double[:] x_load,
+    const double[:] y_load,
+    const double[:] elevation_load,
+    const double[:, :] elevations,
+    floating[:, ::1] out,
+):
+    """Write the Boussinesq vertical pressure into out[elevation, iteration]
+
+    Coordinates are differenced in double precision, see geotech.loads.
+    """
+    cdef Py_ssize_t i, j
+    cdef double dx, dy, r2, z, t
+
+    with nogil:
+        for i in prange(Q.shape[0]):
+            dx = x - x_load[i]
+            dy = y - y_load[i]
+            r2 = dx * dx + dy * dy
+            for j in range(elevations.shape[0]):
+                z = elevation_load[i] - elevations[j, i]
+                t = 1 + r2 / (z * z)
+                out[j, i] = <floating>(1.5 / M_PI * Q[i] / (z * z * t * t * sqrt(t)))
@@ -0,0 +1,22 @@
+import os
+
+import numpy as np
+
+try:
+    import cupy
+except ImportError:  # pragma: no cover - optional dependency
+    cupy = None
+
+# Array module for Monte Carlo samples. CuPy keeps the samples on the GPU when it
+# is installed and a CUDA device has been made visible.
+if cupy is not None and os.environ.get("CUDA_VISIBLE_DEVICES", "") not in ("", "-1"):
+    xp = cupy
+else:
+    xp = np
+
+
+def asnumpy(array) -> np.ndarray:
+    """Return a backend array as a NumPy array in host memory"""
+    if xp is np:
+        return np.asarray(array)
+    return cupy.asnumpy(array)
@@ -1,16 +1,26 @@
-import logging
-
 import numpy as np
 
-logger = logging.getLogger(__name__)
+from geotech.backend import xp
 
 
 class Config:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.iterations = 1000
-            cls._instance.rng = np.random.default_rng(seed=42)
-        return cls._instance
+    """Settings shared by every module for a Monte Carlo run"""
+
+    def __init__(
+        self, iterations: int = 1000, seed: int = 42, dtype: type = np.float32
+    ):
+        self.iterations = iterations
+        self.dtype = dtype  # np.float64 for validation runs
+        self.rng = xp.random.default_rng(seed=seed)
+        self.generation = 0
+
+    def reset_iteration(self):
+        """Start a new Monte Carlo realization.
+
+        Distributions keep their samples until the generation changes, and redraw
+        them the next time they are sampled.
+        """
+        self.generation += 1
+
+
+config = Config()
@@ -1,12 +1,38 @@
-import logging
 from abc import ABC, abstractmethod
 
 import numpy as np
 
-from geotech.config import Config
+from geotech.backend import xp
+from geotech.config import config
 
-logger = logging.getLogger(__name__)
-config = Config()
+
+class _DrawPool:
+    """Buffer of standard random draws, refilled from the generator in batches.
+
+    Distributions take consecutive slices and transform them, so the generator is
+    called once per pool_multiple draws rather than once per distribution.
+    """
+
+    pool_multiple = 64
+
+    def __init__(self, method: str):
+        self.method = method  # name of the config.rng method used to refill
+        self.buffer = xp.empty(0, dtype=config.dtype)
+        self.cursor = 0
+
+    def take(self, size: int) -> np.ndarray:
+        if self.cursor + size > self.buffer.size or self.buffer.dtype != config.dtype:
+            self.buffer = getattr(config.rng, self.method)(
+                size * self.pool_multiple, dtype=config.dtype
+            )
+            self.cursor = 0
+        draws = self.buffer[self.cursor : self.cursor + size]
+        self.cursor += size
+        return draws
+
+
+_standard_normal = _DrawPool("standard_normal")
+_standard_uniform = _DrawPool("random")
 
 
 class ParameterDistribution(ABC):
@@ -16,14 +42,53 @@ class ParameterDistribution(ABC):
     distributions should be implemented as subclasses of this class.
     """
 
+    __slots__ = ("dtype", "_generation", "_cache", "_sample")
+
     @abstractmethod
-    def __init__(self):
+    def __init__(self, dtype: type | None = None):
         """Initialize the distribution parameters
 
-        Randomized sampling should be done here to maintain consistency between
-        different elevations and locations in the same iteration.
+        Randomized sampling is done here to maintain consistency between
+        different elevations and locations in the same iteration. Subclasses should
+        set their parameters before calling this.
+
+        Args:
+            dtype: dtype of the samples. Defaults to config.dtype. Load coordinates
+                require np.float64, see geotech.loads.
         """
-        self.sample_values = None
+        self.dtype = dtype
+        self._redraw()
+
+    @property
+    def _sample_dtype(self) -> type:
+        return config.dtype if self.dtype is None else self.dtype
+
+    def _take(self, pool: _DrawPool) -> np.ndarray:
+        """Take standard draws from the pool in the dtype of the samples"""
+        return pool.take(config.iterations).astype(self._sample_dtype, copy=False)
+
+    @abstractmethod
+    def _draw(self) -> np.ndarray:
+        """Draw a new set of samples, one per iteration."""
+        pass
+
+    def _redraw(self):
+        """Draw samples for the current generation and prepare the view that
+        sample() returns, so that sample() does no work until the generation changes.
+        """
+        self._generation = config.generation
+        self._cache = self._draw()
+        sample = xp.asarray(self._cache).reshape(1, 1, 1, -1)
+        if xp is np:
+            sample.flags.writeable = False
+        self._sample = sample
+
+    @property
+    def sample_values(self) -> np.ndarray:
+        """Samples for the current generation, redrawn only when it changes."""
+        if self._generation != config.generation:
+            self._redraw()
+        return self._cache
 
     def sample(
         self,
@@ -31,15 +96,23 @@ class ParameterDistribution(ABC):
         eastings: float | list[float] = 0.0,
         elevations: float | list[float] = 0.0,
     ):
-        """Return a sample from the distribution."""
-        for param in [northings, eastings, elevations]:
-            if isinstance(param, (int, float)):
-                param = [param]
+        """Return a sample from the distribution.
+
+        The sample is returned as a read-only view with shape (1, 1, 1, iterations),
+        which broadcasts against any (northings, eastings, elevations, iterations)
+        grid without materializing it.
 
-        return np.broadcast_to(
-            self.sample_values,
-            (len(northings), len(eastings), len(elevations), config.iterations),
-        ).copy()
+        Args:
+            northings: northings to sample at, scalar or 1-D
+            eastings: eastings to sample at, scalar or 1-D
+            elevations: elevations to sample at, scalar or 1-D
+
+        The distributions here do not vary in space, so the coordinates are not
+        coerced or inspected.
+        """
+        if self._generation != config.generation:
+            self._redraw()
+        return self._sample
 
     @abstractmethod
     def __repr__(self) -> str:
@@ -47,36 +120,46 @@ class ParameterDistribution(ABC):
 
 
 class Uniform(ParameterDistribution):
-    def __init__(self, lower, upper):
+    __slots__ = ("lower", "upper")
+
+    def __init__(self, lower, upper, dtype: type | None = None):
         self.lower = lower
         self.upper = upper
-        self.sample_values = config.rng.uniform(
-            self.lower, self.upper, size=config.iterations
-        )
+        super().__init__(dtype)
+
+    def _draw(self) -> np.ndarray:
+        draws = self._take(_standard_uniform)
+        return self.lower + (self.upper - self.lower) * draws
 
     def __repr__(self) -> str:
         return f"{self.lower} to {self.upper}"
 
 
 class Normal(ParameterDistribution):
-    def __init__(self, mean, std):
+    __slots__ = ("mean", "std")
+
+    def __init__(self, mean, std, dtype: type | None = None):
         self.mean = mean
         self.std = std
-        self.sample_values = config.rng.normal(
-            self.mean, self.std, size=config.iterations
-        )
+        super().__init__(dtype)
+
+    def _draw(self) -> np.ndarray:
+        return self.mean + self.std * self._take(_standard_normal)
 
     def __repr__(self) -> str:
         return f"{self.mean} +- {self.std}"
 
 
 class LogNormal(ParameterDistribution):
-    def __init__(self, underlying_mean, underlying_std):
+    __slots__ = ("mu", "sigma")
+
+    def __init__(self, underlying_mean, underlying_std, dtype: type | None = None):
         self.mu = underlying_mean  # Of underlying normal distribution
         self.sigma = underlying_std  # Of underlying normal distribution
-        self.sample_values = config.rng.lognormal(
-            self.mu, self.sigma, size=config.iterations
-        )
+        super().__init__(dtype)
+
+    def _draw(self) -> np.ndarray:
+        return xp.exp(self.mu + self.sigma * self._take(_standard_normal))
 
     def __repr__(self) -> str:
         # TODO, figure out a way to do this so it looks right.
@@ -84,17 +167,28 @@ class LogNormal(ParameterDistribution):
 
 
 class Constant(ParameterDistribution):
-    def __init__(self, value):
+    __slots__ = ("value",)
+
+    def __init__(self, value, dtype: type | None = None):
         self.value = value
-        self.sample_values = np.ones(config.iterations) * self.value
+        super().__init__(dtype)
+
+    def _draw(self) -> np.floating:
+        # A scalar broadcasts against every iteration without storing copies
+        return self._sample_dtype(self.value)
 
     def __repr__(self) -> str:
         return f"{self.value}"
 
 
 class Bootstrap(ParameterDistribution):
+    __slots__ = ()
+
     def __init__(self, samples):
         raise NotImplementedError
 
+    def _draw(self) -> np.ndarray:
+        raise NotImplementedError
+
     def __repr__(self) -> str:
         raise NotImplementedError
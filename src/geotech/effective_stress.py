@@ -0,0 +1,50 @@
+import numpy as np
+
+from geotech.backend import xp
+from geotech.soils import PoreWaterPressure, SoilProfile
+
+
+def calculate_effective_stress(
+    profile: SoilProfile, samples: np.ndarray | None = None
+) -> np.ndarray:
+    """Calculate the vertical effective stress at the middle of each layer.
+
+    Total stress is accumulated from the densities of the layers above. A layer
+    uses its wet density when the pore water pressure at its middle is positive,
+    and its dry density otherwise. Negative pore water pressures above the water
+    table are ignored.
+
+    Parameters
+    ----------
+    profile : SoilProfile
+        The soil profile to calculate the effective stresses for.
+    samples : np.ndarray, optional
+        Samples from profile.get_samples(), drawn here when not given.
+
+    Returns
+    -------
+    effective_stress : np.ndarray
+        Effective stress in kPa, with shape (layers, iterations) in the order of
+        profile.layer_index.
+    """
+    if samples is None:
+        samples = profile.get_samples()
+    index = profile.param_index
+    top = samples[:, index["elevation_top"]]
+    bottom = samples[:, index["elevation_bottom"]]
+
+    if isinstance(profile.porewater_pressure, PoreWaterPressure):
+        pore_pressure = profile.porewater_pressure.sample((top + bottom) / 2)
+    else:
+        pore_pressure = profile.porewater_pressure.sample().reshape(-1)
+
+    density = xp.where(
+        pore_pressure > 0.0,
+        samples[:, index["wet_density"]],
+        samples[:, index["dry_density"]],
+    )
+    weight = density * (top - bottom)
+
+    total_stress = xp.cumsum(weight, axis=0)
+    total_stress -= weight / 2
+    return total_stress - xp.maximum(pore_pressure, 0.0)
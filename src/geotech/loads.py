@@ -1,22 +1,124 @@
-import logging
+import math
 from abc import ABC, abstractmethod
 
 import numpy as np
 
-from geotech.config import Config
+from geotech.backend import xp
+from geotech.config import config
 from geotech.distributions import Constant, ParameterDistribution
 
-logger = logging.getLogger(__name__)
-config = Config()
+try:
+    from geotech._boussinesq import boussinesq as _boussinesq_compiled
+except ImportError:  # pragma: no cover - extension not built
+    _boussinesq_compiled = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+try:
+    import numexpr
+except ImportError:  # pragma: no cover - optional dependency
+    numexpr = None
+
+
+# Kernels share one signature: samples are 1-D over iterations, elevations is a
+# (Z, iterations) array, possibly a zero-stride broadcast of a (Z, 1) column, and
+# out is a C-contiguous (Z, iterations) buffer. Coordinates are float64 and are
+# differenced before any cast to the dtype of Q and out, as float32 cannot resolve
+# metre offsets at projected coordinates.
+
+
+def _boussinesq_numpy(Q, x, y, x_load, y_load, elevation_load, elevations, out):
+    """Boussinesq vertical pressure evaluated with in-place NumPy ufuncs"""
+    dx = x - x_load
+    dy = y - y_load
+    r2 = np.multiply(dx, dx, out=dx)
+    r2 += np.multiply(dy, dy, out=dy)
+    r2 = r2.astype(out.dtype, copy=False)
+    z2 = np.subtract(elevation_load, elevations, out=out)
+    z2 *= z2
+
+    # 1.5 Q / (pi z2 t^2.5) with t = 1 + r2 / z2, accumulated in out
+    t = np.divide(r2, z2)
+    t += 1.0
+    z2 *= t
+    z2 *= t
+    z2 *= np.sqrt(t, out=t)
+    np.divide(Q.dtype.type(1.5 / np.pi) * Q, z2, out=out)
+
+
+# 1.5 Q / (pi z2 t^2.5) with t = 1 + r2 / z2, rewritten as 1.5 Q |z|^3 / (pi R2^2.5)
+# with R2 = r2 + z2. numexpr does not eliminate common subexpressions, so R2 is
+# computed twice per element; that is two flops, cheaper than another buffer.
+_R2 = "(r2 + z * z)"
+_BOUSSINESQ_EXPRESSION = f"scale * Q * abs(z)**3 / ({_R2}**2 * sqrt({_R2}))"
+
+
+def _boussinesq_numexpr(Q, x, y, x_load, y_load, elevation_load, elevations, out):
+    """Boussinesq vertical pressure evaluated by numexpr's blocked, threaded VM"""
+    dx = x - x_load
+    dy = y - y_load
+    r2 = (dx * dx + dy * dy).astype(out.dtype, copy=False)
+    z = np.subtract(elevation_load, elevations, out=out)
+    numexpr.evaluate(
+        _BOUSSINESQ_EXPRESSION,
+        local_dict={"Q": Q, "r2": r2, "z": z, "scale": out.dtype.type(1.5 / np.pi)},
+        out=out,
+    )
+
+
+if xp is not np:
+    _boussinesq = xp.ElementwiseKernel(
+        "T Q, float64 x, float64 y, float64 x_load, float64 y_load,"
+        " float64 elevation_load, float64 elevations",
+        "T out",
+        """
+        double dx = x - x_load;
+        double dy = y - y_load;
+        T z = elevation_load - elevations;
+        T t = 1 + T(dx * dx + dy * dy) / (z * z);
+        out = T(1.5 / 3.141592653589793) * Q / (z * z * t * t * sqrt(t));
+        """,
+        "geotech_boussinesq",
+    )
+
+elif _boussinesq_compiled is not None:
+    _boussinesq = _boussinesq_compiled
+
+elif numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _boussinesq(Q, x, y, x_load, y_load, elevation_load, elevations, out):
+        """Fused Boussinesq kernel, one pass with no temporary arrays"""
+        for i in numba.prange(Q.shape[0]):
+            dx = x - x_load[i]
+            dy = y - y_load[i]
+            r2 = dx * dx + dy * dy
+            for j in range(elevations.shape[0]):
+                z = elevation_load[i] - elevations[j, i]
+                t = 1.0 + r2 / (z * z)
+                out[j, i] = 1.5 * Q[i] / (math.pi * z * z * t * t * math.sqrt(t))
+
+elif numexpr is not None:
+    _boussinesq = _boussinesq_numexpr
+
+else:
+    _boussinesq = _boussinesq_numpy
 
 
 class Load(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         pass
 
     @abstractmethod
-    def sample_vertical_pressure(self, x: float, y: float, elevations: float):
+    def sample_vertical_pressure(
+        self, x: float, y: float, elevations: np.ndarray
+    ) -> np.ndarray:
         pass
 
     @abstractmethod
@@ -25,6 +127,9 @@ class Load(ABC):
 
 
 class PointLoad(Load):
+    __slots__ = ("load", "elevation_load", "x_load", "y_load")
+    _coordinates = ("elevation_load", "x_load", "y_load")
+
     def __init__(
         self,
         load: ParameterDistribution,
@@ -37,27 +142,56 @@ class PointLoad(Load):
         self.x_load = x_load  # m
         self.y_load = y_load  # m
 
-        for attr_name, attr_value in self.__dict__.items():
+        for attr_name in self.__slots__:
+            attr_value = getattr(self, attr_name)
             if not isinstance(attr_value, ParameterDistribution):
-                attr_value = Constant(attr_value)
+                dtype = np.float64 if attr_name in self._coordinates else None
+                setattr(self, attr_name, Constant(attr_value, dtype=dtype))
+            elif attr_name in self._coordinates and (
+                attr_value.dtype is None or np.dtype(attr_value.dtype) != np.float64
+            ):
+                raise ValueError(
+                    f"{attr_name} must be drawn in float64, create it with "
+                    "dtype=np.float64"
+                )
 
     def sample_vertical_pressure(
-        self, x: float, y: float, elevations: np.array
-    ) -> np.array:
+        self, x: float, y: float, elevations: np.ndarray
+    ) -> np.ndarray:
         """Calculate the vertical pressure at a given point per Boussinesq
 
+        Args:
+            x: x coordinate of the point in m
+            y: y coordinate of the point in m
+            elevations: elevations of the point in m, scalar or 1-D, or a
+                (Z, iterations) array for elevations that vary by iteration
+
+        Coordinates are handled in float64 whatever config.dtype is, see the kernel
+        notes above.
+
         Returns:
-            vertical pressure in kPa
+            vertical pressure in kPa, with axis 0 over elevations and axis 1 over
+            Monte Carlo iterations
         """
-        x_load = self.x_load.sample()
-        y_load = self.y_load.sample()
-        elevation_load = self.elevation_load.sample()
-        r = np.sqrt((x - x_load) ** 2 + (y - y_load) ** 2)
-        R = np.sqrt(r**2 + elevations.T**2)
-        Q = self.load.sample()
-        z = elevation_load - elevations.T
-
-        return (3 * Q) / (2 * np.pi * z**2) / (1 + (r / z) ** 2) ** (5 / 2)
+        elevations = xp.asarray(elevations, dtype=xp.float64)
+        if elevations.ndim < 2:
+            elevations = elevations.reshape(-1, 1)
+        elevations = xp.broadcast_to(
+            elevations, (elevations.shape[0], config.iterations)
+        )
+        Q = xp.asarray(self.load.sample().reshape(-1), dtype=config.dtype)
+        Q = xp.broadcast_to(Q, (config.iterations,))
+        x_load, y_load, elevation_load = (
+            xp.broadcast_to(
+                xp.asarray(distribution.sample().reshape(-1), dtype=xp.float64),
+                (config.iterations,),
+            )
+            for distribution in (self.x_load, self.y_load, self.elevation_load)
+        )
+
+        out = xp.empty((elevations.shape[0], config.iterations), dtype=config.dtype)
+        _boussinesq(Q, x, y, x_load, y_load, elevation_load, elevations, out)
+        return out
 
     def __repr__(self) -> str:
         return f"{self.load}"
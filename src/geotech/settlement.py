@@ -1,34 +1,48 @@
-import logging
-
 import numpy as np
 
-from geotech.config import Config
+from geotech.backend import xp
+from geotech.config import config
+from geotech.effective_stress import calculate_effective_stress
 from geotech.loads import Load
 from geotech.soils import SoilProfile
 
-logger = logging.getLogger(__name__)
-config = Config()
-
 
-def calculate_settlements(profile: SoilProfile, load: Load, time: float) -> np.ndarray:
+def calculate_settlements(
+    profile: SoilProfile, load: Load, time: float, x: float = 0.0, y: float = 0.0
+) -> np.ndarray:
     """Calculate the settlements for a soil profile.
 
     Parameters
     ----------
     profile : SoilProfile
         The soil profile to calculate the settlements for.
-    load : float
+    load : Load
         The load applied to the soil profile.
     time : float
         The time for which to calculate the settlements.
+    x : float
+        The x coordinate at which to calculate the settlements.
+    y : float
+        The y coordinate at which to calculate the settlements.
 
     Returns
     -------
     settlements : np.ndarray
-        The settlements for the soil profile.
+        The settlements for the soil profile, one per iteration.
     """
-    # settlements = np.zeros(config.iterations)
-    # for layer in profile.layers:
-    #     settlements += layer.calculate_settlements(load, time)
-    # return settlements
-    pass
+    samples = profile.get_samples()
+    initial_effective_stress = calculate_effective_stress(profile, samples)
+
+    # Load induced stress at the mid-layer elevation of every layer and iteration
+    index = profile.param_index
+    top = samples[:, index["elevation_top"]]
+    bottom = samples[:, index["elevation_bottom"]]
+    stress_increase = load.sample_vertical_pressure(x, y, (top + bottom) / 2)
+
+    # Each layer writes into the same scratch buffer before it is accumulated
+    settlements = xp.zeros(config.iterations, dtype=config.dtype)
+    scratch = xp.empty(config.iterations, dtype=config.dtype)
+    for layer, p0, dp in zip(profile.layers, initial_effective_stress, stress_increase):
+        layer.compute_settlement(p0, dp, time, out=scratch)
+        xp.add(settlements, scratch, out=settlements)
+    return settlements
@@ -1,14 +1,12 @@
-import logging
+import math
 from abc import ABC, abstractmethod
 
 import numpy as np
 
-from geotech.config import Config
+from geotech.backend import xp
+from geotech.config import config
 from geotech.distributions import Constant, ParameterDistribution
 
-logger = logging.getLogger(__name__)
-config = Config()
-
 
 class PoreWaterPressure(ABC):
     """Abstract class for pore water pressure.
@@ -17,6 +15,7 @@ class PoreWaterPressure(ABC):
     should be implemented as subclasses of this class.
     """
 
+    __slots__ = ()
     water_unit_weight = 9.81  # kN/m3
 
     @abstractmethod
@@ -35,6 +34,8 @@ class PoreWaterPressure(ABC):
 
 
 class WaterTable(PoreWaterPressure):
+    __slots__ = ("water_table_elevation", "gradient")
+
     def __init__(
         self,
         water_table_elevation: ParameterDistribution,
@@ -50,17 +51,19 @@ class WaterTable(PoreWaterPressure):
         self.water_table_elevation = water_table_elevation  # m
         self.gradient = gradient  # m/m
 
-        for attr_name, attr_value in self.__dict__.items():
+        for attr_name in self.__slots__:
+            attr_value = getattr(self, attr_name)
             if not isinstance(attr_value, ParameterDistribution):
-                attr_value = Constant(attr_value)
+                setattr(self, attr_name, Constant(attr_value))
 
     def sample(self, elevation):
-        water_table_elevation = self.water_table_elevation.sample()
+        """Pore water pressure in kPa, with iterations along the last axis"""
+        water_table_elevation = self.water_table_elevation.sample().reshape(-1)
         hydrostatic = (water_table_elevation - elevation) * self.water_unit_weight
         artesian = (
             (water_table_elevation - elevation)
             * self.water_unit_weight
-            * self.gradient.sample()
+            * self.gradient.sample().reshape(-1)
         )
         return hydrostatic + artesian
 
@@ -69,6 +72,8 @@ class WaterTable(PoreWaterPressure):
 
 
 class MeasuredPoreWaterPressure(PoreWaterPressure):
+    __slots__ = ("pore_water_pressure_measurements",)
+
     def __init__(
         self,
         pore_water_pressure_measurements: list[float, ParameterDistribution],
@@ -79,12 +84,50 @@ class MeasuredPoreWaterPressure(PoreWaterPressure):
             pore_water_pressure_measurements: List of pore water pressure measurements
                 as tuples of elevation (m) and pore water pressure (kPa).
         """
+        measurements = []
+        for elevation, pressure in pore_water_pressure_measurements:
+            if not isinstance(pressure, ParameterDistribution):
+                pressure = Constant(pressure)
+            measurements.append((elevation, pressure))
+        if not measurements:
+            raise ValueError("At least one pore water pressure measurement is required")
+        elevations = [elevation for elevation, _ in measurements]
+        if len(set(elevations)) != len(elevations):
+            raise ValueError(
+                f"Pore water pressure measurements share an elevation: {elevations}"
+            )
+
         self.pore_water_pressure_measurements = sorted(
-            pore_water_pressure_measurements, reverse=True
+            measurements, key=lambda measurement: measurement[0], reverse=True
         )
 
     def sample(self, elevation):
-        return self.groundwater_elevation.sample() + self.gradient.sample()
+        """Pore water pressure in kPa, with iterations along the last axis
+
+        Pressures are interpolated linearly between measurements. Above the highest
+        and below the lowest measurement, the nearest measurement is used.
+        """
+        measurements = self.pore_water_pressure_measurements[::-1]  # ascending
+        pressures = xp.stack(
+            [
+                xp.broadcast_to(pressure.sample().reshape(-1), (config.iterations,))
+                for _, pressure in measurements
+            ]
+        )
+        elevation = xp.asarray(elevation, dtype=config.dtype)
+        if len(measurements) == 1:
+            return pressures[0] + xp.zeros_like(elevation)
+
+        elevations = xp.asarray([e for e, _ in measurements], dtype=config.dtype)
+        upper = xp.clip(xp.searchsorted(elevations, elevation), 1, len(elevations) - 1)
+        lower = upper - 1
+        spacing = elevations[upper] - elevations[lower]
+        weight = xp.clip((elevation - elevations[lower]) / spacing, 0.0, 1.0)
+
+        iteration = xp.arange(config.iterations)
+        lower_pressure = pressures[lower, iteration]
+        upper_pressure = pressures[upper, iteration]
+        return lower_pressure + weight * (upper_pressure - lower_pressure)
 
     def __repr__(self):
         # TODO, format the measurements nicely.
@@ -92,6 +135,19 @@ class MeasuredPoreWaterPressure(PoreWaterPressure):
 
 
 class SoilLayer:
+    parameters = (
+        "elevation_top",
+        "elevation_bottom",
+        "wet_density",
+        "dry_density",
+        "cohesion",
+        "angle_of_internal_friction",
+        "compression_index",
+        "recompression_index",
+        "initial_void_ratio",
+    )
+    __slots__ = ("name", *parameters)
+
     def __init__(
         self,
         name: str,
@@ -116,51 +172,130 @@ class SoilLayer:
         self.recompression_index = recompression_index  # m2/kN
         self.initial_void_ratio = initial_void_ratio  # unitless
 
-        for attr_name, attr_value in self.__dict__.items():
-            if not isinstance(attr_value, ParameterDistribution):
-                attr_value = Constant(attr_value)
+        for param in self.parameters:
+            if not isinstance(getattr(self, param), ParameterDistribution):
+                setattr(self, param, Constant(getattr(self, param)))
 
-    def is_wet(self, groundwater_depth):
-        return self.elevation_top >= groundwater_depth
+    def compute_settlement(
+        self,
+        initial_effective_stress: np.ndarray,
+        stress_increase: np.ndarray,
+        time: float,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Calculate the primary consolidation settlement of the layer
 
-    def get_density(self, groundwater_depth):
-        if self.is_wet(groundwater_depth):
-            return self.wet_density
-        else:
-            return self.dry_density
+        The layer is treated as normally consolidated.
+
+        Args:
+            initial_effective_stress: vertical effective stress at mid-layer in kPa,
+                one per iteration
+            stress_increase: load induced vertical stress at mid-layer in kPa, one
+                per iteration
+            time: time since loading. Consolidation is currently assumed complete,
+                so this does not affect the result.
+            out: optional buffer of length iterations to write the result into
+
+        Returns:
+            settlement in m, one per iteration
+        """
+        if xp.any(initial_effective_stress <= 0):
+            raise ValueError(
+                f"Initial effective stress in layer {self.name} is not positive; "
+                "pore water pressure exceeds total stress"
+            )
+        if out is None:
+            out = xp.empty(config.iterations, dtype=config.dtype)
+
+        top = self.elevation_top.sample().reshape(-1)
+        bottom = self.elevation_bottom.sample().reshape(-1)
+
+        # H Cc / (1 + e0) log10(1 + dp / p0), evaluated in place. log1p keeps the
+        # precision of small stress ratios that 1 + dp / p0 would round away.
+        xp.divide(stress_increase, initial_effective_stress, out=out)
+        xp.log1p(out, out=out)
+        xp.multiply(out, self.compression_index.sample().reshape(-1), out=out)
+        xp.divide(out, 1 + self.initial_void_ratio.sample().reshape(-1), out=out)
+        xp.multiply(out, (top - bottom) / math.log(10), out=out)
+        return out
+
+    def is_wet(self, pore_water_pressure: np.ndarray) -> np.ndarray:
+        """Whether the layer is below the water table, one per iteration
+
+        Args:
+            pore_water_pressure: pore water pressure at mid-layer in kPa
+        """
+        return xp.asarray(pore_water_pressure) > 0.0
+
+    def get_density(self, pore_water_pressure: np.ndarray) -> np.ndarray:
+        """Sample the density of the layer, one per iteration
+
+        Args:
+            pore_water_pressure: pore water pressure at mid-layer in kPa
+
+        Returns:
+            wet density where the layer is wet and dry density elsewhere
+        """
+        return xp.where(
+            self.is_wet(pore_water_pressure),
+            self.wet_density.sample().reshape(-1),
+            self.dry_density.sample().reshape(-1),
+        )
 
     def __repr__(self):
         return f"{self.name} ({self.elevation_top}m to {self.elevation_bottom}m)"
 
 
 class SoilProfile:
+    param_index = {param: i for i, param in enumerate(SoilLayer.parameters)}
+
     def __init__(
         self,
-        layers: list[float, SoilLayer] = [],
+        layers: list[SoilLayer] | None = None,
         pore_water_pressure: PoreWaterPressure = Constant(0.0),
     ):
-        self.layers = layers
+        self.layers = list(layers) if layers else []
         self.porewater_pressure = pore_water_pressure
+        self.samples_array = None
+        self._sorted = False
 
-        if not isinstance(self.porewater_pressure, ParameterDistribution):
+        if not isinstance(
+            self.porewater_pressure, (PoreWaterPressure, ParameterDistribution)
+        ):
             self.porewater_pressure = Constant(self.porewater_pressure)
 
     def add_layer(self, layer: SoilLayer):
         self.layers.append(layer)
-        self.layers.sort(key=lambda x: x.elevation_top, reverse=True)
-
-    def get_samples(self):
-        samples = {}
-        for layer in self.layers:
-            samples[layer.name] = {
-                "elevation_top": layer.elevation_top.sample(),
-                "elevation_bottom": layer.elevation_bottom.sample(),
-                "wet_density": layer.wet_density.sample(),
-                "dry_density": layer.dry_density.sample(),
-                "cohesion": layer.cohesion.sample(),
-                "angle_of_internal_friction": layer.angle_of_internal_friction.sample(),
-                "compression_index": layer.compression_index.sample(),
-                "recompression_index": layer.recompression_index.sample(),
-                "initial_void_ratio": layer.initial_void_ratio.sample(),
-            }
+        self._sorted = False
+
+    def _ensure_sorted(self):
+        """Sort layers from the top down, deferred until they are next used"""
+        if not self._sorted:
+            self.layers.sort(
+                key=lambda layer: float(xp.mean(layer.elevation_top.sample_values)),
+                reverse=True,
+            )
+            self._sorted = True
+
+    @property
+    def layer_index(self) -> dict[str, int]:
+        self._ensure_sorted()
+        return {layer.name: i for i, layer in enumerate(self.layers)}
+
+    def get_samples(self) -> np.ndarray:
+        """Sample the parameters of every layer into a single array
+
+        Returns:
+            array of shape (layers, parameters, iterations), indexed along the
+            first two axes by layer_index and param_index
+        """
+        self._ensure_sorted()
+        samples = xp.empty(
+            (len(self.layers), len(SoilLayer.parameters), config.iterations),
+            dtype=config.dtype,
+        )
+        for i, layer in enumerate(self.layers):
+            for j, param in enumerate(SoilLayer.parameters):
+                samples[i, j] = getattr(layer, param).sample().ravel()
+        self.samples_array = samples
         return samples
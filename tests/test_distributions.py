@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from geotech.backend import asnumpy, xp
+from geotech.config import config
+from geotech.distributions import Normal
+
+
+def test_samples_are_cached_per_generation():
+    distribution = Normal(10.0, 2.0)
+    first = asnumpy(distribution.sample())
+
+    assert np.array_equal(asnumpy(distribution.sample()), first)
+
+    config.reset_iteration()
+    redrawn = distribution.sample()
+
+    assert redrawn.shape == (1, 1, 1, config.iterations)
+    assert not np.array_equal(asnumpy(redrawn), first)
+
+
+@pytest.mark.skipif(xp is not np, reason="only NumPy arrays have a writeable flag")
+def test_sample_is_read_only():
+    sample = Normal(10.0, 2.0).sample()
+
+    assert not sample.flags.writeable
+    with pytest.raises(ValueError):
+        sample[..., 0] = 0.0
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from geotech import loads
+from geotech.backend import asnumpy, xp
+from geotech.config import config
+from geotech.distributions import Normal
+from geotech.loads import PointLoad
+
+
+def boussinesq_reference(Q, x, y, x_load, y_load, elevation_load, elevations):
+    """Closed form Boussinesq vertical pressure in float64"""
+    r2 = (x - x_load) ** 2 + (y - y_load) ** 2
+    elevations = np.asarray(elevations)
+    if elevations.ndim < 2:
+        elevations = elevations.reshape(-1, 1)
+    z = elevation_load - elevations
+    return 3 * Q / (2 * np.pi * z**2) / (1 + r2 / z**2) ** 2.5
+
+
+@pytest.mark.parametrize(
+    "kernel", ["_boussinesq_numpy", "_boussinesq_numexpr", "_boussinesq"]
+)
+def test_vertical_pressure_at_projected_coordinates(monkeypatch, kernel):
+    if kernel == "_boussinesq_numexpr" and loads.numexpr is None:
+        pytest.skip("numexpr is not installed")
+    if kernel != "_boussinesq" and xp is not np:
+        pytest.skip("the NumPy kernels take NumPy arrays")
+    monkeypatch.setattr(loads, "_boussinesq", getattr(loads, kernel))
+    x_load = Normal(500000.0, 0.5, dtype=np.float64)
+    load = PointLoad(Normal(100.0, 10.0), 100.0, x_load, 5000000.0)
+    elevations = np.array([99.0, 95.0, 80.0])
+
+    pressure = load.sample_vertical_pressure(500001.3, 5000000.7, elevations)
+
+    expected = boussinesq_reference(
+        asnumpy(load.load.sample()).reshape(-1).astype(np.float64),
+        500001.3,
+        5000000.7,
+        asnumpy(x_load.sample()).reshape(-1),
+        5000000.0,
+        100.0,
+        elevations,
+    )
+    assert pressure.shape == (3, config.iterations)
+    assert np.allclose(asnumpy(pressure), expected, rtol=1e-5, atol=0.0)
+
+
+def kernel_inputs(dtype):
+    rng = np.random.default_rng(0)
+    iterations = 200
+    Q = rng.uniform(50.0, 150.0, iterations).astype(dtype)
+    x_load = 500000.0 + rng.normal(0.0, 2.0, iterations)
+    y_load = 5000000.0 + rng.normal(0.0, 2.0, iterations)
+    elevation_load = rng.uniform(99.0, 101.0, iterations)
+    elevations = np.array([[97.0], [90.0], [75.0], [40.0]])
+    elevations = elevations + rng.uniform(-0.5, 0.5, (4, iterations))
+    return Q, 500001.3, 5000000.7, x_load, y_load, elevation_load, elevations
+
+
+@pytest.mark.skipif(xp is not np, reason="the inputs are NumPy arrays")
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize(
+    "kernel",
+    [
+        "_boussinesq_numpy",
+        "_boussinesq_numexpr",
+        "_boussinesq_compiled",
+        "_boussinesq",
+    ],
+)
+def test_kernels_match_closed_form(kernel, dtype):
+    if kernel == "_boussinesq_numexpr" and loads.numexpr is None:
+        pytest.skip("numexpr is not installed")
+    if kernel == "_boussinesq_compiled" and loads._boussinesq_compiled is None:
+        pytest.skip("the Cython extension is not built")
+    inputs = kernel_inputs(dtype)
+    out = np.empty((inputs[-1].shape[0], inputs[0].shape[0]), dtype=dtype)
+
+    getattr(loads, kernel)(*inputs, out)
+
+    expected = boussinesq_reference(inputs[0].astype(np.float64), *inputs[1:])
+    assert np.allclose(out, expected, rtol=1e-5, atol=0.0)
+
+
+def test_elevations_can_vary_by_iteration():
+    load = PointLoad(Normal(100.0, 10.0), 100.0, 0.0, 0.0)
+    elevations = np.linspace(90.0, 99.0, config.iterations)
+
+    pressure = load.sample_vertical_pressure(1.0, 1.0, elevations[np.newaxis])
+
+    expected = boussinesq_reference(
+        asnumpy(load.load.sample()).reshape(-1).astype(np.float64),
+        1.0,
+        1.0,
+        0.0,
+        0.0,
+        100.0,
+        elevations[np.newaxis],
+    )
+    assert isinstance(pressure, xp.ndarray)
+    assert pressure.shape == (1, config.iterations)
+    assert np.allclose(asnumpy(pressure), expected, rtol=1e-5, atol=0.0)
+
+
+def test_coordinate_distributions_must_be_float64():
+    with pytest.raises(ValueError, match="x_load must be drawn in float64"):
+        PointLoad(100.0, 100.0, Normal(500000.0, 0.5), 5000000.0)
@@ -1,5 +1,10 @@
-from geotech.config import Config
+import numpy as np
+
+from geotech.backend import asnumpy, xp
+from geotech.config import config
+from geotech.distributions import Constant
 from geotech.loads import PointLoad
+from geotech.settlement import calculate_settlements
 from geotech.soils import SoilLayer, SoilProfile, WaterTable
 
 layer1 = SoilLayer("A", 100, 90, 20, 18, 0, 35, 0.33, 0.03, 1)
@@ -10,3 +15,23 @@ pwp = WaterTable(0, 0.0)
 profile = SoilProfile([layer1, layer2], pwp)
 
 load = PointLoad(100, 100, 0, 0)
+
+
+def test_scalar_parameters_become_constants():
+    assert isinstance(layer1.wet_density, Constant)
+    assert layer1.name == "A"
+    assert isinstance(pwp.water_table_elevation, Constant)
+    assert isinstance(load.load, Constant)
+    assert profile.porewater_pressure is pwp
+
+
+def test_calculate_settlements():
+    settlements = calculate_settlements(profile, load, 0.0)
+
+    # Both layers are above the water table, so p0 uses the dry density of 18 kN/m3.
+    # A: p0 = 90 kPa, dp = 3 * 100 / (2 pi 5^2) = 1.910 kPa at 5 m below the load
+    # B: p0 = 270 kPa, dp = 3 * 100 / (2 pi 15^2) = 0.212 kPa at 15 m below the load
+    # s = 10 * 0.33 / 2 * (log10(1 + 1.910 / 90) + log10(1 + 0.212 / 270))
+    assert isinstance(settlements, xp.ndarray)
+    assert settlements.shape == (config.iterations,)
+    assert np.allclose(asnumpy(settlements), 0.015610, rtol=1e-4)
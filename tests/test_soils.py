@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from geotech.backend import asnumpy, xp
+from geotech.config import config
+from geotech.soils import MeasuredPoreWaterPressure, SoilLayer, SoilProfile
+
+
+def test_layers_added_out_of_order_are_sorted_top_down():
+    lower = SoilLayer("lower", 80, 70, 20, 18, 0, 35, 0.33, 0.03, 1)
+    upper = SoilLayer("upper", 100, 90, 20, 18, 0, 35, 0.33, 0.03, 1)
+    middle = SoilLayer("middle", 90, 80, 20, 18, 0, 35, 0.33, 0.03, 1)
+
+    profile = SoilProfile([lower])
+    profile.add_layer(upper)
+    profile.add_layer(middle)
+
+    assert profile.layer_index == {"upper": 0, "middle": 1, "lower": 2}
+    assert [layer.name for layer in profile.layers] == ["upper", "middle", "lower"]
+
+    samples = profile.get_samples()
+    top = samples[:, profile.param_index["elevation_top"]]
+    assert np.array_equal(asnumpy(top[:, 0]), [100.0, 90.0, 80.0])
+
+
+def test_profiles_do_not_share_layers():
+    first = SoilProfile()
+    first.add_layer(SoilLayer("A", 100, 90, 20, 18, 0, 35, 0.33, 0.03, 1))
+
+    assert SoilProfile().layers == []
+
+
+def test_measured_pore_water_pressure_interpolates():
+    measured = MeasuredPoreWaterPressure([(90, 0.0), (70, 200.0), (80, 100.0)])
+
+    assert np.allclose(asnumpy(measured.sample(85.0)), 50.0)
+    assert np.allclose(asnumpy(measured.sample(60.0)), 200.0)
+
+
+@pytest.mark.parametrize("measurements", [[], [(80, 10.0), (90, 0.0), (80, 20.0)]])
+def test_measured_pore_water_pressure_rejects_invalid_measurements(measurements):
+    with pytest.raises(ValueError):
+        MeasuredPoreWaterPressure(measurements)
+
+
+def test_compute_settlement_rejects_non_positive_effective_stress():
+    layer = SoilLayer("A", 100, 90, 20, 18, 0, 35, 0.33, 0.03, 1)
+    initial_effective_stress = xp.full(config.iterations, 10.0)
+    initial_effective_stress[-1] = -5.0
+
+    with pytest.raises(ValueError, match="pore water pressure exceeds total stress"):
+        layer.compute_settlement(initial_effective_stress, 50.0, 0)
+
+
+def test_density_follows_pore_water_pressure():
+    layer = SoilLayer("A", 100, 90, 20, 18, 0, 35, 0.33, 0.03, 1)
+    pore_water_pressure = np.zeros(config.iterations)
+    pore_water_pressure[::2] = 10.0
+
+    density = asnumpy(layer.get_density(pore_water_pressure))
+
+    assert density.shape == (config.iterations,)
+    assert np.array_equal(density[::2], np.full_like(density[::2], 20.0))
+    assert np.array_equal(density[1::2], np.full_like(density[1::2], 18.0))